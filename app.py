@@ -1,6 +1,7 @@
 from flask import Flask, render_template
+from sqlalchemy import event
 from config import Config
-from extensions import db
+from extensions import db, cache, migrate
 
 def create_app():
     app = Flask(__name__)
@@ -8,11 +9,23 @@ def create_app():
     app.secret_key = 'your-secret-key-change-this'
 
     db.init_app(app)
-
+    cache.init_app(app)
+
+    # In development, any relationship a query did not load through its
+    # options raises on access instead of lazy loading one SELECT per row
+    # (mapper-level eager defaults are overridden too, so routes must say
+    # what they load)
+    if app.debug:
+        @event.listens_for(db.session, 'do_orm_execute')
+        def raise_on_implicit_loads(orm_execute_state):
+            if (orm_execute_state.is_select
+                    and not orm_execute_state.is_column_load
+                    and not orm_execute_state.is_relationship_load):
+                orm_execute_state.statement = orm_execute_state.statement.options(db.raiseload('*'))
+
+    # Schema is managed by migrations (flask db upgrade), not at startup
     from models import Patient, Appointment, Consultation
-
-    with app.app_context():
-        db.create_all()
+    migrate.init_app(app, db)
 
     # Register blueprints
     from routes.patients import patients_bp
@@ -1,13 +1,37 @@
+import multiprocessing
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Each gunicorn worker has its own pool, so split one connection budget
+# across the workers gunicorn.conf.py starts. The default of 120 stays
+# below MySQL's default max_connections (151), leaving room for admin
+# sessions and migrations.
+DB_CONNECTION_BUDGET = int(os.getenv("DB_CONNECTION_BUDGET", 120))
+_workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+_connections_per_worker = max(DB_CONNECTION_BUDGET // _workers, 2)
+
 class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # workers * (pool_size + max_overflow) must stay below the server's
+    # max_connections; extra gevent requests wait for a free connection
     SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", _connections_per_worker // 2)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", _connections_per_worker - _connections_per_worker // 2)),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "pool_use_lifo": True,
+        # Compiled-statement cache; the default 500 is shared by every query shape
+        "query_cache_size": 1200,
         "connect_args": {
             "ssl": {"ssl": True}
         }
     }
+    # Redis shares cached entries and their invalidation across gunicorn
+    # workers. Without CACHE_REDIS_URL each worker keeps its own SimpleCache,
+    # and a write clears only the worker that served it: the others can show
+    # a stale active-patient list for up to 30 seconds.
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
+    CACHE_TYPE = os.getenv("CACHE_TYPE", "RedisCache" if CACHE_REDIS_URL else "SimpleCache")
@@ -1,3 +1,7 @@
+from flask_caching import Cache
+from flask_migrate import Migrate
 from flask_sqlalchemy import SQLAlchemy
 
 db = SQLAlchemy()
+cache = Cache()
+migrate = Migrate()
@@ -0,0 +1,10 @@
+import multiprocessing
+import os
+
+# Every route waits on SQL round-trips, so cooperative gevent workers let
+# one process serve many requests concurrently. PyMySQL is pure Python and
+# is patched by the gevent worker without extra setup.
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+worker_class = "gevent"
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 1000))
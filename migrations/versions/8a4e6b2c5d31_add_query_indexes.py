@@ -0,0 +1,31 @@
+"""add query indexes
+
+Revision ID: 8a4e6b2c5d31
+Revises: 3f1c2a9d7b10
+Create Date: 2026-10-14 10:05:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a4e6b2c5d31'
+down_revision = '3f1c2a9d7b10'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_patients_status', 'patients', ['status'], unique=False)
+    op.create_index('ix_appt_dt', 'appointments', ['appointment_datetime'], unique=False)
+    op.create_index('ix_consult_appt', 'consultations', ['appointment_id'], unique=True)
+    op.create_index('ix_consult_patient_status_created', 'consultations',
+                    ['patient_id', 'status', sa.text('created_at DESC')], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_consult_patient_status_created', table_name='consultations')
+    op.drop_index('ix_consult_appt', table_name='consultations')
+    op.drop_index('ix_appt_dt', table_name='appointments')
+    op.drop_index('ix_patients_status', table_name='patients')
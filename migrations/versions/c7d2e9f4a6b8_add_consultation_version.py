@@ -0,0 +1,26 @@
+"""add consultation version
+
+Revision ID: c7d2e9f4a6b8
+Revises: 8a4e6b2c5d31
+Create Date: 2026-10-14 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c7d2e9f4a6b8'
+down_revision = '8a4e6b2c5d31'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('consultations', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('version_id', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('consultations', schema=None) as batch_op:
+        batch_op.drop_column('version_id')
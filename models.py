@@ -13,13 +13,19 @@ class Patient(db.Model):
     status = db.Column(db.String(20), default="Active")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
 
-    appointments = db.relationship("Appointment", backref="patient", lazy=True)
-    consultations = db.relationship("Consultation", backref="patient", lazy=True)
+    appointments = db.relationship("Appointment", backref="patient", lazy="selectin")
+    consultations = db.relationship("Consultation", backref="patient", lazy="selectin")
 
     def __repr__(self):
         return f"<Patient {self.name}>"
 
 
+db.Index("ix_patients_status", Patient.status)
+
+# No index on name/phone: the ILIKE '%term%' search has a leading wildcard
+# (and compiles to lower(col) LIKE ... on MySQL), so no index can serve it
+
+
 class Appointment(db.Model):
     __tablename__ = "appointments"
 
@@ -29,12 +35,15 @@ class Appointment(db.Model):
     appointment_datetime = db.Column(db.DateTime, nullable=False)
     status = db.Column(db.String(20), default="Scheduled")
 
-    consultation = db.relationship("Consultation", backref="appointment", uselist=False, cascade="all, delete-orphan")
+    consultation = db.relationship("Consultation", backref="appointment", uselist=False, lazy="joined", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Appointment {self.id} - {self.status}>"
 
 
+db.Index("ix_appt_dt", Appointment.appointment_datetime)
+
+
 class Consultation(db.Model):
     __tablename__ = "consultations"
 
@@ -46,6 +55,21 @@ class Consultation(db.Model):
     notes = db.Column(db.Text)
     status = db.Column(db.String(20), default="Draft")
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    version_id = db.Column(db.Integer, nullable=False, server_default="1")
+
+    # UPDATEs check the version they loaded, so concurrent writes raise
+    # StaleDataError instead of silently overwriting each other
+    __mapper_args__ = {"version_id_col": version_id}
 
     def __repr__(self):
         return f"<Consultation {self.id} - {self.status}>"
+
+
+# One consultation per appointment
+db.Index("ix_consult_appt", Consultation.appointment_id, unique=True)
+
+# Covers patient_consultations: filter on patient_id + status, newest first
+db.Index(
+    "ix_consult_patient_status_created",
+    Consultation.patient_id, Consultation.status, Consultation.created_at.desc(),
+)
@@ -1,18 +1,34 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash
 from extensions import db
-from models import Appointment, Patient, Consultation
-from datetime import datetime, date
+from models import Appointment, Patient
+from routes.patients import get_active_patients
+from datetime import datetime, date, time, timedelta
 
 appointments_bp = Blueprint('appointments', __name__, url_prefix='/appointments')
 
+def parse_appointment_datetime(value):
+    """Parse an ISO 8601 / datetime-local string into naive server-local time, as stored in the DB"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed
+
 @appointments_bp.route('/today', methods=['GET'])
 def today_appointments():
     """List all appointments scheduled for today"""
     today = date.today()
+    start_of_day = datetime.combine(today, time.min)
+    end_of_day = start_of_day + timedelta(days=1)
     
-    appointments = Appointment.query.filter(
-        db.func.date(Appointment.appointment_datetime) == today
-    ).all()
+    # Half-open range keeps the appointment_datetime index usable; plain
+    # columns with the patient joined in, no ORM objects for a read-only page
+    appointments = db.session.query(
+        Appointment.id, Appointment.doctor_name, Appointment.appointment_datetime, Appointment.status,
+        Patient.name.label('patient_name'), Patient.phone.label('patient_phone')
+    ).join(Patient, Appointment.patient_id == Patient.id).filter(
+        Appointment.appointment_datetime >= start_of_day,
+        Appointment.appointment_datetime < end_of_day
+    ).order_by(Appointment.appointment_datetime).all()
     
     return render_template('appointments/today.html', appointments=appointments, today=today)
 
@@ -30,7 +46,11 @@ def create_appointment():
                 flash('Valid patient selection is required', 'error')
                 return redirect(url_for('appointments.create_appointment'))
             
-            patient = Patient.query.get(int(patient_id))
+            # Only the name and status are needed; no Patient object or its
+            # relationships are loaded
+            patient = db.session.query(Patient.name, Patient.status).filter_by(
+                id=int(patient_id)
+            ).first()
             if not patient:
                 flash('Patient not found', 'error')
                 return redirect(url_for('appointments.create_appointment'))
@@ -49,13 +69,14 @@ def create_appointment():
                 return redirect(url_for('appointments.create_appointment'))
             
             try:
-                appointment_datetime = datetime.fromisoformat(appointment_datetime_str)
+                appointment_datetime = parse_appointment_datetime(appointment_datetime_str)
             except ValueError:
                 flash('Invalid date/time format', 'error')
                 return redirect(url_for('appointments.create_appointment'))
             
-            # Check if appointment is in the past
-            if appointment_datetime < datetime.now():
+            # Check if appointment is in the past (compared as aware local
+            # times so a DST change cannot flip the result)
+            if appointment_datetime.astimezone() < datetime.now().astimezone():
                 flash('Cannot create appointment in the past', 'error')
                 return redirect(url_for('appointments.create_appointment'))
             
@@ -79,14 +100,16 @@ def create_appointment():
             return redirect(url_for('appointments.create_appointment'))
     
     # Get active patients for dropdown
-    active_patients = Patient.query.filter_by(status='Active').all()
-    return render_template('appointments/create.html', patients=active_patients)
+    return render_template('appointments/create.html', patients=get_active_patients())
 
 @appointments_bp.route('/<int:appointment_id>', methods=['GET'])
 def view_appointment(appointment_id):
     """View appointment details"""
-    appointment = Appointment.query.get_or_404(appointment_id)
-    consultation = Consultation.query.filter_by(appointment_id=appointment_id).first()
+    appointment = Appointment.query.options(
+        db.joinedload(Appointment.patient).raiseload('*'),
+        db.joinedload(Appointment.consultation)
+    ).filter_by(id=appointment_id).first_or_404()
+    consultation = appointment.consultation
     
     return render_template('appointments/view.html', appointment=appointment, consultation=consultation)
 
@@ -94,7 +117,9 @@ def view_appointment(appointment_id):
 def cancel_appointment(appointment_id):
     """Cancel an appointment"""
     try:
-        appointment = Appointment.query.get_or_404(appointment_id)
+        appointment = Appointment.query.options(
+            db.raiseload(Appointment.consultation)
+        ).filter_by(id=appointment_id).first_or_404()
         
         # Check if appointment can be cancelled
         if appointment.status == 'Completed':
@@ -1,24 +1,31 @@
-from flask import Blueprint, request, render_template, redirect, url_for, flash
+from flask import Blueprint, request, render_template, stream_template, redirect, url_for, flash, get_flashed_messages
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.exc import StaleDataError
 from extensions import db
 from models import Consultation, Appointment, Patient
 from datetime import datetime
 
 consultations_bp = Blueprint('consultations', __name__, url_prefix='/consultations')
 
+CONSULTATIONS_PER_PAGE = 20
+
 @consultations_bp.route('/new/<int:appointment_id>', methods=['GET', 'POST'])
 def create_consultation(appointment_id):
     """Create a new consultation for an appointment"""
-    appointment = Appointment.query.get_or_404(appointment_id)
-    patient = Patient.query.get(appointment.patient_id)
+    appointment = Appointment.query.options(
+        db.joinedload(Appointment.patient).raiseload('*'),
+        db.joinedload(Appointment.consultation)
+    ).filter_by(id=appointment_id).first_or_404()
+    patient = appointment.patient
     
     # Check if appointment status is Scheduled
     if appointment.status != 'Scheduled':
         flash('Consultation can only be created for scheduled appointments', 'error')
         return redirect(url_for('appointments.view_appointment', appointment_id=appointment_id))
     
-    # Check if consultation already exists
-    existing_consultation = Consultation.query.filter_by(appointment_id=appointment_id).first()
-    if existing_consultation:
+    # Check if consultation already exists (joined above, no extra query);
+    # the unique index on appointment_id catches concurrent submissions
+    if appointment.consultation is not None:
         flash('A consultation already exists for this appointment', 'error')
         return redirect(url_for('appointments.view_appointment', appointment_id=appointment_id))
     
@@ -48,6 +55,11 @@ def create_consultation(appointment_id):
             flash('Consultation created successfully in Draft status', 'success')
             return redirect(url_for('consultations.view_consultation', consultation_id=consultation.id))
         
+        except IntegrityError:
+            db.session.rollback()
+            flash('A consultation already exists for this appointment', 'error')
+            return redirect(url_for('appointments.view_appointment', appointment_id=appointment_id))
+        
         except Exception as e:
             db.session.rollback()
             flash(f'Error creating consultation: {str(e)}', 'error')
@@ -58,9 +70,12 @@ def create_consultation(appointment_id):
 @consultations_bp.route('/<int:consultation_id>', methods=['GET'])
 def view_consultation(consultation_id):
     """View consultation details"""
-    consultation = Consultation.query.get_or_404(consultation_id)
-    appointment = Appointment.query.get(consultation.appointment_id)
-    patient = Patient.query.get(consultation.patient_id)
+    consultation = Consultation.query.options(
+        db.joinedload(Consultation.appointment),
+        db.joinedload(Consultation.patient).raiseload('*')
+    ).filter_by(id=consultation_id).first_or_404()
+    appointment = consultation.appointment
+    patient = consultation.patient
     
     return render_template('consultations/view.html', consultation=consultation, appointment=appointment, patient=patient)
 
@@ -68,49 +83,77 @@ def view_consultation(consultation_id):
 def complete_consultation(consultation_id):
     """Mark consultation as completed and update appointment status"""
     try:
-        consultation = Consultation.query.get_or_404(consultation_id)
-        appointment = Appointment.query.get(consultation.appointment_id)
-        
-        # Check if consultation is already completed
-        if consultation.status == 'Completed':
-            flash('Consultation is already completed', 'error')
-            return redirect(url_for('consultations.view_consultation', consultation_id=consultation_id))
+        # Conditional UPDATE instead of read-then-write: of two racing
+        # requests only one can move the consultation out of Draft. Bumping
+        # version_id makes a concurrent edit of the same row fail as stale.
+        completed = db.session.execute(
+            db.update(Consultation)
+            .where(Consultation.id == consultation_id, Consultation.status != 'Completed')
+            .values(status='Completed', version_id=Consultation.version_id + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
         
-        # Update consultation status to Completed
-        consultation.status = 'Completed'
-        
-        # Update appointment status to Completed (business rule)
-        appointment.status = 'Completed'
-        
-        db.session.commit()
-        
-        flash('Consultation marked as completed and appointment updated', 'success')
-        return redirect(url_for('consultations.view_consultation', consultation_id=consultation_id))
+        if completed:
+            # Update appointment status to Completed (business rule)
+            db.session.execute(
+                db.update(Appointment)
+                .where(Appointment.id == db.select(Consultation.appointment_id).where(
+                    Consultation.id == consultation_id
+                ).scalar_subquery())
+                .values(status='Completed')
+                .execution_options(synchronize_session=False)
+            )
+            db.session.commit()
     
     except Exception as e:
         db.session.rollback()
         flash(f'Error completing consultation: {str(e)}', 'error')
         return redirect(url_for('consultations.view_consultation', consultation_id=consultation_id))
+    
+    if not completed:
+        # Nothing updated: the consultation is missing or already completed
+        db.session.query(Consultation.id).filter_by(id=consultation_id).first_or_404()
+        flash('Consultation is already completed', 'error')
+        return redirect(url_for('consultations.view_consultation', consultation_id=consultation_id))
+    
+    flash('Consultation marked as completed and appointment updated', 'success')
+    return redirect(url_for('consultations.view_consultation', consultation_id=consultation_id))
 
 @consultations_bp.route('/patient/<int:patient_id>', methods=['GET'])
 def patient_consultations(patient_id):
     """View all completed consultations for a patient"""
-    patient = Patient.query.get_or_404(patient_id)
+    # Consultations are paginated below; skip the default selectin loads
+    patient = Patient.query.options(
+        db.raiseload(Patient.appointments),
+        db.raiseload(Patient.consultations)
+    ).filter_by(id=patient_id).first_or_404()
+    page = request.args.get('page', 1, type=int)
     
-    # Get all completed consultations for this patient
-    consultations = Consultation.query.filter_by(
-        patient_id=patient_id,
-        status='Completed'
-    ).order_by(Consultation.created_at.desc()).all()
+    # Get completed consultations for this patient, newest first, as plain
+    # columns with the doctor name joined in from the appointment
+    pagination = db.session.query(
+        Consultation.id, Consultation.status, Consultation.created_at,
+        Consultation.vitals, Consultation.notes, Appointment.doctor_name
+    ).join(Appointment, Consultation.appointment_id == Appointment.id).filter(
+        Consultation.patient_id == patient_id,
+        Consultation.status == 'Completed'
+    ).order_by(Consultation.created_at.desc()).paginate(page=page, per_page=CONSULTATIONS_PER_PAGE, error_out=False)
     
-    return render_template('consultations/patient_history.html', patient=patient, consultations=consultations)
+    # Stream the page so the header reaches the browser while the vitals and
+    # notes are still rendering. Flashes are popped here, while the session
+    # cookie can still be updated; the template reads them from the request.
+    get_flashed_messages()
+    return stream_template('consultations/patient_history.html', patient=patient, consultations=pagination.items, pagination=pagination)
 
 @consultations_bp.route('/<int:consultation_id>/edit', methods=['GET', 'POST'])
 def edit_consultation(consultation_id):
     """Edit consultation (only in Draft status)"""
-    consultation = Consultation.query.get_or_404(consultation_id)
-    appointment = Appointment.query.get(consultation.appointment_id)
-    patient = Patient.query.get(consultation.patient_id)
+    consultation = Consultation.query.options(
+        db.joinedload(Consultation.appointment),
+        db.joinedload(Consultation.patient).raiseload('*')
+    ).filter_by(id=consultation_id).first_or_404()
+    appointment = consultation.appointment
+    patient = consultation.patient
     
     # Check if consultation is in Draft status
     if consultation.status != 'Draft':
@@ -133,6 +176,12 @@ def edit_consultation(consultation_id):
             flash('Consultation updated successfully', 'success')
             return redirect(url_for('consultations.view_consultation', consultation_id=consultation_id))
         
+        except StaleDataError:
+            # version_id moved on: completed or edited by another request
+            db.session.rollback()
+            flash('This consultation was changed or completed elsewhere; your edit was not saved', 'error')
+            return redirect(url_for('consultations.view_consultation', consultation_id=consultation_id))
+        
         except Exception as e:
             db.session.rollback()
             flash(f'Error updating consultation: {str(e)}', 'error')
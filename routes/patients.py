@@ -1,24 +1,71 @@
 from flask import Blueprint, request, render_template, redirect, url_for, flash
-from extensions import db
-from models import Patient
+from extensions import db, cache
+from models import Patient, Appointment
 from datetime import datetime
 
 patients_bp = Blueprint('patients', __name__, url_prefix='/patients')
 
+PATIENTS_PER_PAGE = 50
+
+@cache.memoize(timeout=30)
+def get_active_patients():
+    """(id, name, phone) rows for active patients, used by the appointment form"""
+    return db.session.query(Patient.id, Patient.name, Patient.phone).filter_by(
+        status='Active'
+    ).order_by(Patient.name).all()
+
+def bulk_create_patients(rows):
+    """Insert patient dicts (name, gender, age, phone) as Active in one executemany, for bulk imports"""
+    # Same rules as create_patient; raises ValueError before anything is written
+    patients = []
+    now = datetime.utcnow()
+    for number, row in enumerate(rows, start=1):
+        name, gender, age, phone = (
+            '' if row.get(key) is None else str(row[key]).strip()
+            for key in ('name', 'gender', 'age', 'phone')
+        )
+        
+        if not name or not gender or not phone:
+            raise ValueError(f'Row {number}: name, gender and phone are required')
+        if not age.isdigit() or int(age) > 150:
+            raise ValueError(f'Row {number}: valid age is required (0-150)')
+        
+        patients.append(dict(name=name, gender=gender, age=int(age), phone=phone, status='Active', created_at=now))
+    
+    # An empty parameter list would run one INSERT with only the defaults
+    if not patients:
+        return 0
+    
+    try:
+        db.session.execute(db.insert(Patient), patients)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    
+    cache.delete_memoized(get_active_patients)
+    return len(patients)
+
 @patients_bp.route('/', methods=['GET'])
 def list_patients():
     """List all patients with search functionality"""
     search_query = request.args.get('search', '').strip()
+    page = request.args.get('page', 1, type=int)
     
+    # Read-only page: select plain columns instead of hydrating Patient objects
+    query = db.session.query(
+        Patient.id, Patient.name, Patient.gender, Patient.age,
+        Patient.phone, Patient.status, Patient.created_at
+    )
     if search_query:
-        patients = Patient.query.filter(
+        query = query.filter(
             (Patient.name.ilike(f'%{search_query}%')) |
             (Patient.phone.ilike(f'%{search_query}%'))
-        ).all()
-    else:
-        patients = Patient.query.all()
+        )
+    
+    pagination = query.order_by(Patient.id).paginate(page=page, per_page=PATIENTS_PER_PAGE, error_out=False)
     
-    return render_template('patients/list.html', patients=patients, search_query=search_query)
+    return render_template('patients/list.html', patients=pagination.items, pagination=pagination, search_query=search_query)
 
 @patients_bp.route('/create', methods=['GET', 'POST'])
 def create_patient():
@@ -59,6 +106,7 @@ def create_patient():
             
             db.session.add(patient)
             db.session.commit()
+            cache.delete_memoized(get_active_patients)
             
             flash(f'Patient {name} created successfully!', 'success')
             return redirect(url_for('patients.list_patients'))
@@ -73,13 +121,17 @@ def create_patient():
 @patients_bp.route('/<int:patient_id>', methods=['GET'])
 def view_patient(patient_id):
     """View patient details"""
-    patient = Patient.query.get_or_404(patient_id)
+    # The page lists appointments only, not their consultations
+    patient = Patient.query.options(
+        db.selectinload(Patient.appointments).raiseload(Appointment.consultation),
+        db.raiseload(Patient.consultations)
+    ).filter_by(id=patient_id).first_or_404()
     return render_template('patients/view.html', patient=patient)
 
 @patients_bp.route('/<int:patient_id>/edit', methods=['GET', 'POST'])
 def edit_patient(patient_id):
     """Edit patient status"""
-    patient = Patient.query.get_or_404(patient_id)
+    patient = Patient.query.options(db.raiseload('*')).filter_by(id=patient_id).first_or_404()
     
     if request.method == 'POST':
         try:
@@ -89,8 +141,11 @@ def edit_patient(patient_id):
                 flash('Invalid status', 'error')
                 return redirect(url_for('patients.edit_patient', patient_id=patient_id))
             
+            status_changed = patient.status != new_status
             patient.status = new_status
             db.session.commit()
+            if status_changed:
+                cache.delete_memoized(get_active_patients)
             
             flash(f'Patient status updated to {new_status}', 'success')
             return redirect(url_for('patients.view_patient', patient_id=patient_id))